@@ -7,33 +7,102 @@
 #  http://opensource.org/licenses/mit-license.php
 import asyncio
 import base64
-import json
 import logging
 import os
+import re
 from asyncio import Future
 from contextlib import asynccontextmanager
-from copy import deepcopy
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import partial
 from http import HTTPStatus
 from pathlib import Path
-from typing import cast, AsyncIterator, Final, Any, Mapping, Literal
-from urllib.parse import urlencode, quote
+from typing import Annotated, AsyncIterator, Final, Any, Literal, Mapping, TypeAlias
+from urllib.parse import quote_from_bytes
+from uuid import uuid4
 
-import requests
-from fastapi import FastAPI, Request, HTTPException
+import httpx
+import orjson
 from mcp.server import FastMCP
 from mcp.server.fastmcp import Context
-from pydantic import Field, BaseModel
+from pydantic import BeforeValidator, Field, BaseModel, ConfigDict, TypeAdapter
+from starlette.applications import Starlette
 from starlette.datastructures import QueryParams
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
 from uvicorn import Config, Server
 from uvicorn.config import LOGGING_CONFIG
 
+try:
+    from AppKit import NSWorkspace, NSWorkspaceOpenConfiguration  # type: ignore
+    from Foundation import NSURL  # type: ignore
+except ImportError:
+    NSWorkspace = None
+
 BASE_URL = "bear://x-callback-url"
 
 LOGGER = logging.getLogger(__name__)
 
 
+# Characters quote() never escapes; values made only of these are emitted as they are.
+_UNRESERVED: Final = re.compile(r"[A-Za-z0-9_.~-]*")
+
+
+def _encode_params(params: Mapping[str, str]) -> str:
+    """Build a query string, percent-encoding values the same way as urlencode(params, quote_via=quote).
+
+    Keys are used as they are, so they must consist of URL-safe characters.
+    """
+    unreserved = _UNRESERVED.fullmatch
+    return "&".join(f"{k}={v if unreserved(v) else quote_from_bytes(v.encode(), b'')}" for k, v in params.items())
+
+
+# Constant parameters that keep Bear in the background while serving each action,
+# percent-encoded once so that each request only encodes its own arguments.
+_OPEN_NOTE_QUERY: Final = _encode_params(
+    {
+        "new_window": "no",
+        "float": "no",
+        "show_window": "no",
+        "open_note": "no",
+        "selected": "no",
+        # Removed "pin": "no" to preserve existing pin status
+        "edit": "no",
+    }
+)
+_CREATE_QUERY: Final = _encode_params(
+    {
+        "open_note": "no",
+        "new_window": "no",
+        "float": "no",
+        "show_window": "no",
+    }
+)
+_ADD_TEXT_QUERY: Final = _encode_params(
+    {
+        "open_note": "no",
+        "new_window": "no",
+        "show_window": "no",
+        "edit": "no",
+    }
+)
+_REPLACE_QUERY: Final = f"mode=replace&{_ADD_TEXT_QUERY}"
+_REPLACE_ALL_QUERY: Final = f"mode=replace_all&{_ADD_TEXT_QUERY}"
+_PREPEND_QUERY: Final = f"mode=prepend&{_ADD_TEXT_QUERY}"
+_ADD_FILE_QUERY: Final = _encode_params(
+    {
+        "selected": "no",
+        "open_note": "no",
+        "new_window": "no",
+        "show_window": "no",
+        "edit": "no",
+    }
+)
+_HIDE_WINDOW_QUERY: Final = _encode_params({"show_window": "no"})
+
+
 @dataclass
 class ErrorResponse(Exception):
     errorCode: int
@@ -43,68 +112,114 @@ class ErrorResponse(Exception):
         return self.errorMessage
 
 
-@dataclass
+@dataclass(slots=True)
 class AppContext:
     futures: dict[str, Future[QueryParams]]
+    http_client: httpx.AsyncClient
+
+
+AppCtx: TypeAlias = Context[Any, AppContext]
 
 
 @asynccontextmanager
 async def app_lifespan(_server: FastMCP, uds: Path) -> AsyncIterator[AppContext]:
-    callback = FastAPI()
     futures: dict[str, Future[QueryParams]] = {}
 
-    @callback.post("/{req_id}/success", status_code=HTTPStatus.NO_CONTENT, include_in_schema=False)
-    def success(req_id: str, req: Request) -> None:
-        if req_id not in futures:
-            raise HTTPException(status_code=404, detail="Request not found")
-
-        futures[req_id].set_result(req.query_params)
+    # A single route serves both outcomes; the handler only needs the path parameters and the query string,
+    # so it is a bare Starlette endpoint without any body parsing or validation.
+    async def resolve(req: Request) -> Response:
+        path_params = req.path_params
+        kind = path_params["kind"]
+        if kind not in ("success", "error"):
+            return Response("Unknown callback", status_code=HTTPStatus.NOT_FOUND)
 
-    @callback.post("/{req_id}/error", status_code=HTTPStatus.NO_CONTENT, include_in_schema=False)
-    def error(req_id: str, req: Request) -> None:
-        if req_id not in futures:
-            raise HTTPException(status_code=404, detail="Request not found")
+        future = futures.get(path_params["req_id"])
+        if future is None:
+            return Response("Request not found", status_code=HTTPStatus.NOT_FOUND)
 
         q = req.query_params
-        futures[req_id].set_exception(
-            ErrorResponse(
-                errorCode=int(q.get("error-Code") or "0"),
-                errorMessage=q.get("errorMessage") or "",
+        if kind == "success":
+            future.set_result(q)
+        else:
+            future.set_exception(
+                ErrorResponse(
+                    errorCode=int(q.get("error-Code") or "0"),
+                    errorMessage=q.get("errorMessage") or "",
+                )
             )
-        )
+        return Response(status_code=HTTPStatus.NO_CONTENT)
+
+    callback = Starlette(routes=[Route("/{req_id}/{kind}", resolve, methods=["POST"])])
 
-    log_config = deepcopy(LOGGING_CONFIG)
-    log_config["handlers"]["access"]["stream"] = "ext://sys.stderr"
+    # copy only the path down to the access handler instead of deep-copying the whole config
+    handlers = LOGGING_CONFIG["handlers"]
+    log_config = {
+        **LOGGING_CONFIG,
+        "handlers": {**handlers, "access": {**handlers["access"], "stream": "ext://sys.stderr"}},
+    }
     server = Server(
         Config(
             app=callback,
             uds=str(uds),
             log_level="warning",
             log_config=log_config,
+            access_log=False,
+            # the callback app needs neither websockets nor ASGI lifespan events
+            ws="none",
+            lifespan="off",
+            # Bear returns note contents in the callback URL, which exceeds httptools' URL size limit,
+            # so pin h11 instead of letting uvicorn pick httptools whenever it is installed.
+            http="h11",
             h11_max_incomplete_event_size=1024 * 1024,  # 1MB
         )
     )
 
+    # shared across add_file calls so that connections to the same host are kept alive
+    http_client = httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+    )
+
     LOGGER.info(f"Starting callback server on {uds}")
     server_task = asyncio.create_task(server.serve())
     try:
-        yield AppContext(futures=futures)
+        yield AppContext(futures=futures, http_client=http_client)
     finally:
         LOGGER.info("Stopping callback server")
         server.should_exit = True
         await server_task
+        await http_client.aclose()
 
         if uds.exists():
             os.unlink(uds)
 
 
+# Response models are read-only snapshots of Bear's output.
+_RESPONSE_MODEL_CONFIG: Final = ConfigDict(frozen=True, extra="ignore")
+
+
+def _decode_tags(value: Any) -> Any:
+    """Decode a list of tags, which Bear returns as a JSON encoded string."""
+    if type(value) is str:
+        return orjson.loads(value)
+    return value
+
+
+# Bear sends note tags as a JSON encoded string; both note models decode them the same way.
+_Tags: TypeAlias = Annotated[list[str] | None, BeforeValidator(_decode_tags)]
+
+
 class Note(BaseModel):
     """Note model."""
 
+    model_config = _RESPONSE_MODEL_CONFIG
+
     note: str = Field(description="note text")
     identifier: str = Field(description="note unique identifier")
     title: str = Field(description="note title")
-    tags: list[str] | None = Field(description="list of tags", default=None)
+    tags: _Tags = Field(description="list of tags", default=None)
     is_trashed: str = Field(description="yes if the note is trashed", default="no")
     modificationDate: str = Field(description="note modification date in ISO 8601 format")
     creationDate: str = Field(description="note creation date in ISO 8601 format")
@@ -113,6 +228,8 @@ class Note(BaseModel):
 class NoteID(BaseModel):
     """Note identifier."""
 
+    model_config = _RESPONSE_MODEL_CONFIG
+
     identifier: str = Field(description="note unique identifier")
     title: str = Field(description="note title")
 
@@ -120,9 +237,11 @@ class NoteID(BaseModel):
 class NoteInfo(BaseModel):
     """Note information."""
 
+    model_config = _RESPONSE_MODEL_CONFIG
+
     title: str = Field(description="note title")
     identifier: str = Field(description="note unique identifier")
-    tags: list[str] | None = Field(description="list of tags", default=None)
+    tags: _Tags = Field(description="list of tags", default=None)
     modificationDate: str = Field(description="note modification date in ISO 8601 format")
     creationDate: str = Field(description="note creation date in ISO 8601 format")
     pin: str = Field(description="note pin status", default="no")
@@ -131,97 +250,127 @@ class NoteInfo(BaseModel):
 class ModifiedNote(BaseModel):
     """Modified note."""
 
+    model_config = _RESPONSE_MODEL_CONFIG
+
     note: str = Field(description="note text")
     title: str = Field(description="note title")
 
 
+class _Tag(BaseModel):
+    """Tag entry in the list returned by Bear's /tags action."""
+
+    name: str | None = None
+
+
 def server(token: str, uds: Path) -> FastMCP:
     mcp = FastMCP("Bear", lifespan=partial(app_lifespan, uds=uds))
 
+    # The callback prefix only depends on the socket path, so it is quoted once here.
+    callback_prefix: Final[str] = quote_from_bytes(f"xfwder://{uds.stem}/".encode(), b"")
+    # The token is fixed for the lifetime of the server, so the queries carrying it are encoded once as well.
+    token_query: Final[str] = _encode_params({"token": token})
+    hidden_token_query: Final[str] = f"{_HIDE_WINDOW_QUERY}&{token_query}"
+
+    def _build_url(path: str, params: dict[str, str], fixed_query: str, req_id: str) -> str:
+        callback = callback_prefix + quote_from_bytes(req_id.encode(), b"")
+        query = f"x-success={callback}%2Fsuccess&x-error={callback}%2Ferror"
+        if params:
+            query = f"{_encode_params(params)}&{query}"
+        if fixed_query:
+            query = f"{fixed_query}&{query}"
+        return f"{BASE_URL}/{path}?{query}"
+
     async def _request(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         path: str,
         params: dict[str, str],
+        fixed_query: str = "",
     ) -> QueryParams:
         req_id = ctx.request_id
-        params = {
-            **params,
-            "x-success": f"xfwder://{uds.stem}/{req_id}/success",
-            "x-error": f"xfwder://{uds.stem}/{req_id}/error",
-        }
-
-        future = Future[QueryParams]()
-        ctx.request_context.lifespan_context.futures[req_id] = future
+        futures = ctx.request_context.lifespan_context.futures
+        future: Future[QueryParams]
+        futures[req_id] = future = asyncio.get_running_loop().create_future()
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "open",
-                "-g",
-                "-j",
-                f"{BASE_URL}/{path}?{urlencode(params, quote_via=quote)}",
-            )
-            returncode = await proc.wait()
-            if returncode != 0:
-                raise RuntimeError(f"failed to open Bear (exit code: {returncode}).")
+            await _open_url(_build_url(path, params, fixed_query, req_id))
             return await future
 
         finally:
-            del ctx.request_context.lifespan_context.futures[req_id]
+            del futures[req_id]
+
+    async def _request_many(
+        ctx: AppCtx,
+        path: str,
+        params_list: list[dict[str, str]],
+        fixed_query: str = "",
+    ) -> list[QueryParams]:
+        """Send the same action once per parameter set without waiting for each response in turn.
+
+        Every call gets its own random callback id, so it can't collide with MCP request ids,
+        which clients are free to choose. All futures are registered before any URL is opened.
+        """
+        req_ids = [uuid4().hex for _ in params_list]
+        futures = ctx.request_context.lifespan_context.futures
+        loop = asyncio.get_running_loop()
+        for req_id in req_ids:
+            futures[req_id] = loop.create_future()
+
+        # without PyObjC every URL spawns a process, so don't fork them all at once
+        opening = asyncio.Semaphore(_MAX_CONCURRENT_OPENS)
+
+        async def open_url(params: dict[str, str], req_id: str) -> None:
+            async with opening:
+                await _open_url(_build_url(path, params, fixed_query, req_id))
+
+        try:
+            await asyncio.gather(*(open_url(params, req_id) for params, req_id in zip(params_list, req_ids)))
+            return list(await asyncio.gather(*(futures[req_id] for req_id in req_ids)))
+
+        finally:
+            for req_id in req_ids:
+                del futures[req_id]
 
     @mcp.tool()
     async def open_note(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         id: str | None = Field(description="note unique identifier", default=None),
         title: str | None = Field(description="note title", default=None),
     ) -> Note:
         """Open a note identified by its title or id and return its content."""
-        params = {
-            "new_window": "no",
-            "float": "no",
-            "show_window": "no",
-            "open_note": "no",
-            "selected": "no",
-            # Removed "pin": "no" to preserve existing pin status
-            "edit": "no",
-        }
-        if id is not None:
-            params["id"] = id
-        if title is not None:
-            params["title"] = title
-
-        return Note.model_validate(_fix_tags(await _request(ctx, "open-note", params)))
+        params = _present(id=id, title=title)
+        return Note.model_validate(await _request(ctx, "open-note", params, _OPEN_NOTE_QUERY))
+
+    @mcp.tool()
+    async def open_notes(
+        ctx: AppCtx,
+        ids: list[str] = Field(description="list of note unique identifiers"),
+    ) -> list[Note]:
+        """Open multiple notes identified by their ids at once and return their contents."""
+        results = await _request_many(ctx, "open-note", [{"id": note_id} for note_id in ids], _OPEN_NOTE_QUERY)
+        return [Note.model_validate(res) for res in results]
 
     @mcp.tool()
     async def create(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         title: str | None = Field(description="note title", default=None),
         text: str | None = Field(description="note body", default=None),
         tags: list[str] | None = Field(description="list of tags", default=None),
         timestamp: bool = Field(description="prepend the current date and time to the text", default=False),
     ) -> NoteID:
         """Create a new note and return its unique identifier. Empty notes are not allowed."""
-        params = {
-            "open_note": "no",
-            "new_window": "no",
-            "float": "no",
-            "show_window": "no",
-        }
-        if title is not None:
-            params["title"] = title
-        if text is not None:
-            if title:
-                # remove the title from the note text to avoid being duplicated
-                text = text.removeprefix("# " + title)
-            params["text"] = text
-        if tags is not None:
-            params["tags"] = ",".join(tags)
-        if timestamp:
-            params["timestamp"] = "yes"
-
-        return NoteID.model_validate(await _request(ctx, "create", params))
+        if text is not None and title:
+            # remove the title from the note text to avoid being duplicated
+            text = text.removeprefix("# " + title)
+        params = _present(
+            title=title,
+            text=text,
+            tags=",".join(tags) if tags is not None else None,
+            timestamp="yes" if timestamp else None,
+        )
+        return NoteID.model_validate(await _request(ctx, "create", params, _CREATE_QUERY))
 
     @mcp.tool()
     async def replace_note(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         id: str | None = Field(description="note unique identifier", default=None),
         title: str | None = Field(description="new title for the note", default=None),
         text: str | None = Field(description="new text to replace note content", default=None),
@@ -229,50 +378,31 @@ def server(token: str, uds: Path) -> FastMCP:
         timestamp: bool = Field(description="prepend the current date and time to the text", default=False),
     ) -> ModifiedNote:
         """Replace the content of an existing note identified by its id."""
-        mode = "replace_all" if title is not None else "replace"
-        params = {
-            "mode": mode,
-            "open_note": "no",
-            "new_window": "no",
-            "show_window": "no",
-            "edit": "no",
-        }
-        if id is not None:
-            params["id"] = id
-        if text is not None:
-            params["text"] = text
-        if title is not None:
-            params["title"] = title
-        if tags is not None:
-            params["tags"] = ",".join(tags)
-        if timestamp:
-            params["timestamp"] = "yes"
-
-        return ModifiedNote.model_validate(await _request(ctx, "add-text", params))
+        params = _present(
+            id=id,
+            text=text,
+            title=title,
+            tags=",".join(tags) if tags is not None else None,
+            timestamp="yes" if timestamp else None,
+        )
+        fixed_query = _REPLACE_ALL_QUERY if title is not None else _REPLACE_QUERY
+        return ModifiedNote.model_validate(await _request(ctx, "add-text", params, fixed_query))
 
     @mcp.tool()
     async def add_title(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         id: str = Field(description="note unique identifier"),
         title: str = Field(description="new title for the note"),
     ) -> None:
         """Add a title to a note identified by its id."""
         if not title.startswith("# "):
             title = "# " + title
-        params = {
-            "id": id,
-            "text": title,
-            "mode": "prepend",
-            "open_note": "no",
-            "new_window": "no",
-            "show_window": "no",
-            "edit": "no",
-        }
-        await _request(ctx, "add-text", params)
+        params = {"id": id, "text": title}
+        await _request(ctx, "add-text", params, _PREPEND_QUERY)
 
     @mcp.tool()
     async def add_file(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         id: str | None = Field(description="note unique identifier", default=None),
         title: str | None = Field(description="note title", default=None),
         file: str = Field(description="base64 representation of a file or a URL to a file to add to the note"),
@@ -284,64 +414,37 @@ def server(token: str, uds: Path) -> FastMCP:
     ) -> None:
         """Append or prepend a file to a note identified by its title or id."""
         if file.startswith("http://") or file.startswith("https://"):
-            res = requests.get(file)
-            res.raise_for_status()
-            file = base64.b64encode(res.content).decode("ascii")
-
-        params = {
-            "selected": "no",
-            "open_note": "no",
-            "new_window": "no",
-            "show_window": "no",
-            "edit": "no",
-            "file": file,
-            "filename": filename,
-        }
-        if id is not None:
-            params["id"] = id
-        if title is not None:
-            params["title"] = title
-        if header is not None:
-            params["header"] = header
-        if mode is not None:
-            params["mode"] = mode
-
-        await _request(ctx, "add-file", params)
+            file = await _download_base64(ctx.request_context.lifespan_context.http_client, file)
+
+        params = _present(file=file, filename=filename, id=id, title=title, header=header, mode=mode)
+        await _request(ctx, "add-file", params, _ADD_FILE_QUERY)
 
     @mcp.tool()
     async def tags(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
     ) -> list[str]:
         """Return all the tags currently displayed in Bear’s sidebar."""
-        params = {
-            "token": token,
-        }
-
-        res = await _request(ctx, "tags", params)
+        res = await _request(ctx, "tags", {}, token_query)
         raw_tags = res.get("tags")
         if raw_tags is None:
             return []
 
-        notes = cast(list[dict[str, str]], json.loads(raw_tags))
-        return [note["name"] for note in notes if "name" in note]
+        return [tag.name for tag in _TAGS_ADAPTER.validate_json(raw_tags) if tag.name is not None]
 
     @mcp.tool()
     async def open_tag(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         name: str = Field(description="tag name or a list of tags divided by comma"),
     ) -> list[NoteInfo]:
         """Show all the notes which have a selected tag in bear."""
-        params = {
-            "name": name,
-            "token": token,
-        }
+        params = {"name": name}
 
-        res = await _request(ctx, "open-tag", params)
+        res = await _request(ctx, "open-tag", params, token_query)
         return parse_notes(res.get("notes"))
 
     @mcp.tool()
     async def rename_tag(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         name: str = Field(description="tag name"),
         new_name: str = Field(description="new tag name"),
     ) -> None:
@@ -350,17 +453,13 @@ def server(token: str, uds: Path) -> FastMCP:
         This call can’t be performed if the app is a locked state.
         If the tag contains any locked note this call will not be performed.
         """
-        params = {
-            "name": name,
-            "new_name": new_name,
-            "show_window": "no",
-        }
+        params = {"name": name, "new_name": new_name}
 
-        await _request(ctx, "rename-tag", params)
+        await _request(ctx, "rename-tag", params, _HIDE_WINDOW_QUERY)
 
     @mcp.tool()
     async def delete_tag(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         name: str = Field(description="tag name"),
     ) -> None:
         """Delete an existing tag.
@@ -368,28 +467,18 @@ def server(token: str, uds: Path) -> FastMCP:
          This call can’t be performed if the app is a locked state.
         If the tag contains any locked note this call will not be performed.
         """
-        params = {
-            "name": name,
-            "show_window": "no",
-        }
+        params = {"name": name}
 
-        await _request(ctx, "delete-tag", params)
+        await _request(ctx, "delete-tag", params, _HIDE_WINDOW_QUERY)
 
-    async def move_note(ctx: Context[Any, AppContext], id: str | None, search: str | None, dest: str) -> None:
+    async def move_note(ctx: AppCtx, id: str | None, search: str | None, dest: str) -> None:
         """Move a note identified by its title or id to the given destination."""
-        params = {
-            "show_window": "no",
-        }
-        if id is not None:
-            params["id"] = id
-        if search is not None:
-            params["search"] = search
-
-        await _request(ctx, dest, params)
+        params = _present(id=id, search=search)
+        await _request(ctx, dest, params, _HIDE_WINDOW_QUERY)
 
     @mcp.tool()
     async def trash(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         id: str | None = Field(description="note unique identifier", default=None),
         search: str | None = Field(description="string to search.", default=None),
     ) -> None:
@@ -402,7 +491,7 @@ def server(token: str, uds: Path) -> FastMCP:
 
     @mcp.tool()
     async def archive(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         id: str | None = Field(description="note unique identifier", default=None),
         search: str | None = Field(description="string to search.", default=None),
     ) -> None:
@@ -413,21 +502,15 @@ def server(token: str, uds: Path) -> FastMCP:
         """
         await move_note(ctx, id, search, "archive")
 
-    async def sidebar_items(ctx: Context[Any, AppContext], kind: str, search: str | None) -> list[NoteInfo]:
+    async def sidebar_items(ctx: AppCtx, kind: str, search: str | None) -> list[NoteInfo]:
         """List notes in the specified sidebar."""
-        params = {
-            "show_window": "no",
-            "token": token,
-        }
-        if search is not None:
-            params["search"] = search
-
-        res = await _request(ctx, kind, params)
+        params = _present(search=search)
+        res = await _request(ctx, kind, params, hidden_token_query)
         return parse_notes(res.get("notes"))
 
     @mcp.tool()
     async def untagged(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         search: str | None = Field(description="string to search", default=None),
     ) -> list[NoteInfo]:
         """Select the Untagged sidebar item."""
@@ -435,7 +518,7 @@ def server(token: str, uds: Path) -> FastMCP:
 
     @mcp.tool()
     async def todo(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         search: str | None = Field(description="string to search", default=None),
     ) -> list[NoteInfo]:
         """Select the Todo sidebar item."""
@@ -443,7 +526,7 @@ def server(token: str, uds: Path) -> FastMCP:
 
     @mcp.tool()
     async def today(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         search: str | None = Field(description="string to search", default=None),
     ) -> list[NoteInfo]:
         """Select the Today sidebar item."""
@@ -451,7 +534,7 @@ def server(token: str, uds: Path) -> FastMCP:
 
     @mcp.tool()
     async def locked(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         search: str | None = Field(description="string to search", default=None),
     ) -> list[NoteInfo]:
         """Select the Locked sidebar item."""
@@ -459,26 +542,18 @@ def server(token: str, uds: Path) -> FastMCP:
 
     @mcp.tool()
     async def search(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         term: str | None = Field(description="string to search", default=None),
         tag: str | None = Field(description="tag to search into", default=None),
     ) -> list[NoteInfo]:
         """Show search results in Bear for all notes or for a specific tag."""
-        params = {
-            "show_window": "no",
-            "token": token,
-        }
-        if term is not None:
-            params["term"] = term
-        if tag is not None:
-            params["tag"] = tag
-
-        res = await _request(ctx, "search", params)
+        params = _present(term=term, tag=tag)
+        res = await _request(ctx, "search", params, hidden_token_query)
         return parse_notes(res.get("notes"))
 
     @mcp.tool()
     async def grab_url(
-        ctx: Context[Any, AppContext],
+        ctx: AppCtx,
         url: str = Field(description="url to grab"),
         tags: list[str] | None = Field(
             description="list of tags. If tags are specified in the Bear’s web content preferences, this parameter is ignored.",
@@ -486,30 +561,141 @@ def server(token: str, uds: Path) -> FastMCP:
         ),
     ) -> NoteID:
         """Create a new note with the content of a web page and return its unique identifier."""
-        params = {
-            "url": url,
-        }
-        if tags is not None:
-            params["tags"] = ",".join(tags)
-
+        params = _present(url=url, tags=",".join(tags) if tags is not None else None)
         return NoteID.model_validate(await _request(ctx, "grab-url", params))
 
     return mcp
 
 
-def _fix_tags(obj: dict | QueryParams) -> Mapping[str, Any]:
-    if "tags" not in obj:
-        return obj
-    tags = obj["tags"]
-    if isinstance(tags, str):
-        return {**obj, "tags": json.loads(tags)}
-    return obj
+# absolute path, so spawning doesn't search PATH
+_OPEN_COMMAND: Final = "/usr/bin/open"
+# upper bound of URLs being opened at the same time by a single batched request
+_MAX_CONCURRENT_OPENS: Final = 8
+
+
+async def _open_url(url: str) -> None:
+    """Open the given URL without bringing the handling app to the foreground.
+
+    LaunchServices is called directly through PyObjC when it is installed,
+    otherwise this falls back to spawning `/usr/bin/open -g -j`.
+    """
+    if NSWorkspace is not None:
+        await _open_url_with_workspace(url)
+        return
+
+    # the MCP protocol runs over our stdio, so keep the child away from it
+    proc = await asyncio.create_subprocess_exec(
+        _OPEN_COMMAND, "-g", "-j", url, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.DEVNULL
+    )
+    returncode = await proc.wait()
+    if returncode != 0:
+        raise RuntimeError(f"failed to open Bear (exit code: {returncode}).")
+
+
+async def _open_url_with_workspace(url: str) -> None:
+    ns_url = NSURL.URLWithString_(url)
+    if ns_url is None:
+        raise ValueError("failed to build a URL for Bear.")
+
+    config = NSWorkspaceOpenConfiguration.configuration()
+    config.setActivates_(False)
+    config.setHides_(True)
+
+    loop = asyncio.get_running_loop()
+    future: Future[None] = loop.create_future()
+
+    def resolve(error: Any) -> None:
+        if future.done():
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(RuntimeError(f"failed to open Bear ({error.localizedDescription()})."))
+
+    def completion_handler(_app: Any, error: Any) -> None:
+        # invoked on a background queue
+        loop.call_soon_threadsafe(resolve, error)
+
+    NSWorkspace.sharedWorkspace().openURL_configuration_completionHandler_(ns_url, config, completion_handler)
+    await future
+
+
+_DOWNLOAD_ATTEMPTS: Final = 4
+_RETRY_STATUS: Final = frozenset({HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.BAD_GATEWAY, HTTPStatus.SERVICE_UNAVAILABLE})
+_RETRY_BACKOFF: Final = 0.5
+_MAX_RETRY_DELAY: Final = 30.0
+
+
+async def _download_base64(client: httpx.AsyncClient, url: str) -> str:
+    """Download a file and return its base64 representation.
+
+    The body is encoded chunk by chunk while streaming, so the raw content is never held in memory as a whole.
+    Rate-limited or unavailable responses and transport errors are retried with exponential backoff,
+    honouring the server's Retry-After header when present.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        last_attempt = attempt == _DOWNLOAD_ATTEMPTS
+        delay = _RETRY_BACKOFF * 2**attempt
+        encoded = bytearray()
+        pending = b""
+        retry_delay: float | None = None
+        try:
+            async with client.stream("GET", url) as res:
+                if res.status_code in _RETRY_STATUS and not last_attempt:
+                    retry_delay = _retry_after(res.headers.get("Retry-After"), delay)
+                    # drain the error body so that the connection goes back to the pool while waiting
+                    await res.aread()
+                else:
+                    res.raise_for_status()
+                    async for chunk in res.aiter_bytes(chunk_size=64 * 1024):
+                        data = pending + chunk
+                        # base64 encodes 3 bytes at a time, so carry the remainder over to the next chunk
+                        size = len(data) - len(data) % 3
+                        encoded += base64.b64encode(memoryview(data)[:size])
+                        pending = data[size:]
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+            retry_delay = delay
+
+        if retry_delay is not None:
+            await asyncio.sleep(retry_delay)
+            continue
+
+        encoded += base64.b64encode(pending)
+        return encoded.decode("ascii")
+
+
+def _retry_after(value: str | None, default: float) -> float:
+    """Return the delay in seconds requested by a Retry-After header, or the default one."""
+    if value is None:
+        return default
+    try:
+        # delay-seconds is a non-negative integer (RFC 9110), which also keeps out "nan" and "inf"
+        delay = float(int(value))
+    except ValueError:
+        try:
+            delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return default
+    return min(max(delay, 0.0), _MAX_RETRY_DELAY)
+
+
+def _present(**params: str | None) -> dict[str, str]:
+    """Return the given parameters without the unset ones, keeping their order."""
+    return {k: v for k, v in params.items() if v is not None}
+
+
+_NOTES_ADAPTER: Final[TypeAdapter[list[NoteInfo]]] = TypeAdapter(list[NoteInfo])
+_TAGS_ADAPTER: Final[TypeAdapter[list[_Tag]]] = TypeAdapter(list[_Tag])
 
 
 def parse_notes(raw: str | None) -> list[NoteInfo]:
     if raw is None:
         return []
-    return [NoteInfo.model_validate(_fix_tags(obj)) for obj in json.loads(raw)]
+    return _NOTES_ADAPTER.validate_json(raw)
 
 
 __all__: Final = ["server"]
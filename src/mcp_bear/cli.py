@@ -11,9 +11,11 @@ import string
 import subprocess
 import sys
 import tarfile
+from importlib.util import find_spec
 from logging import Logger
 from pathlib import Path
 
+import anyio
 import requests
 import rich_click as click
 from requests import HTTPError
@@ -77,5 +79,6 @@ def main(token: str) -> None:
     mcp = server(token, uds)
 
     logger.info("Starting MCP server (Press CTRL+D to quit)")
-    mcp.run()
+    # the callback server shares this event loop, so run it on uvloop when available
+    anyio.run(mcp.run_stdio_async, backend_options={"use_uvloop": find_spec("uvloop") is not None})
     logger.info("MCP server stopped")
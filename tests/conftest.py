@@ -8,6 +8,7 @@
 
 # type: ignore
 import logging
+from importlib.util import find_spec
 
 import pytest
 
@@ -15,8 +16,9 @@ from mcp_bear.cli import init_forwarder
 
 
 @pytest.fixture(scope="module")
-def anyio_backend() -> str:
-    return "asyncio"
+def anyio_backend() -> tuple[str, dict]:
+    # run the tests on the same event loop the CLI uses
+    return "asyncio", {"use_uvloop": find_spec("uvloop") is not None}
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -28,6 +28,7 @@ async def test_list_tools(mcp_client_session: ClientSession) -> None:
     tools = set(tool.name for tool in res.tools)
 
     assert "open_note" in tools
+    assert "open_notes" in tools
     assert "create" in tools
     assert "replace_note" in tools
     assert "add_file" in tools
@@ -9,19 +9,37 @@
 import asyncio
 import json
 import random
-from asyncio.subprocess import Process
+import threading
+from asyncio.subprocess import Process, DEVNULL
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 from pathlib import Path
-from typing import Generator, Tuple, AsyncGenerator, Any
-from unittest.mock import patch, MagicMock
+from typing import Generator, Tuple, AsyncGenerator, Any, Callable
+from unittest.mock import patch, MagicMock, AsyncMock, call, ANY
 from urllib.parse import urlparse, parse_qs, urlencode, quote
 
+import httpx
 import pytest
 from mcp.server import FastMCP
 from mcp.server.fastmcp import Context
 from mcp.server.fastmcp.exceptions import ToolError
 from mcp.shared.context import RequestContext
-
-from mcp_bear import server, AppContext, BASE_URL, Note, NoteID, NoteInfo, ModifiedNote
+from starlette.datastructures import QueryParams
+
+from mcp_bear import (
+    server,
+    AppContext,
+    BASE_URL,
+    Note,
+    NoteID,
+    NoteInfo,
+    ModifiedNote,
+    _retry_after,
+    _DOWNLOAD_ATTEMPTS,
+    _open_url,
+    _MAX_CONCURRENT_OPENS,
+    _download_base64,
+)
 from mcp_bear.cli import generate_file_suffix
 
 BEAR_TOKEN = "abcdefg"
@@ -64,7 +82,7 @@ async def mcp_server(temp_socket: Path) -> AsyncGenerator[Tuple[FastMCP, Context
 def mock_create_subprocess_exec() -> Generator[MagicMock, None, None]:
     original_exec = asyncio.create_subprocess_exec
 
-    with patch("asyncio.create_subprocess_exec") as mock_exec:
+    with patch("asyncio.create_subprocess_exec") as mock_exec, patch("mcp_bear.NSWorkspace", None):
 
         async def side_effect(cmd: str, *args: str, **_kwargs: Any) -> Process:
             queries = parse_qs(urlparse(args[2]).query)
@@ -82,7 +100,7 @@ def mock_create_subprocess_exec() -> Generator[MagicMock, None, None]:
 def mock_create_subprocess_exec_error() -> Generator[MagicMock, None, None]:
     original_exec = asyncio.create_subprocess_exec
 
-    with patch("asyncio.create_subprocess_exec") as mock_exec:
+    with patch("asyncio.create_subprocess_exec") as mock_exec, patch("mcp_bear.NSWorkspace", None):
 
         async def side_effect(cmd: str, *args: str, **_kwargs: Any) -> Process:
             queries = parse_qs(urlparse(args[2]).query)
@@ -96,13 +114,38 @@ def mock_create_subprocess_exec_error() -> Generator[MagicMock, None, None]:
 
 
 @pytest.fixture
-def mock_requests_get() -> Generator[MagicMock, None, None]:
-    with patch("requests.get") as mock_get:
+def mock_httpx_stream() -> Generator[MagicMock, None, None]:
+    with patch("httpx.AsyncClient.stream") as mock_stream:
+
+        async def aiter_bytes(*_args: Any, **_kwargs: Any) -> AsyncGenerator[bytes, None]:
+            # split so that chunk boundaries don't align with base64's 3-byte groups
+            for chunk in (b"mocked", b" http", b" request"):
+                yield chunk
+
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.content = b"mocked http request"
-        mock_get.return_value = mock_response
-        yield mock_get
+        mock_response.aiter_bytes = aiter_bytes
+        mock_stream.return_value.__aenter__.return_value = mock_response
+        yield mock_stream
+
+
+@pytest.fixture
+def mock_workspace() -> Generator[Tuple[MagicMock, MagicMock, MagicMock], None, None]:
+    with (
+        patch("mcp_bear.NSWorkspace") as mock_ws,
+        patch("mcp_bear.NSURL", create=True) as mock_url,
+        patch("mcp_bear.NSWorkspaceOpenConfiguration", create=True) as mock_config,
+        patch("asyncio.create_subprocess_exec") as mock_exec,
+    ):
+        mock_ws.error = None
+
+        def open_url(_url: Any, _config: Any, handler: Callable[[Any, Any], None]) -> None:
+            # LaunchServices calls the completion handler on a background queue
+            threading.Thread(target=handler, args=(MagicMock(), mock_ws.error)).start()
+
+        mock_ws.sharedWorkspace.return_value.openURL_configuration_completionHandler_.side_effect = open_url
+        yield mock_ws, mock_url, mock_config
+        mock_exec.assert_not_called()
 
 
 @pytest.mark.anyio
@@ -142,7 +185,12 @@ async def test_open_note(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/open-note?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/open-note?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -158,6 +206,132 @@ async def test_open_note_failed(
     assert len(ctx.request_context.lifespan_context.futures) == 0
 
 
+@pytest.mark.anyio
+async def test_open_notes(
+    temp_socket: Path,
+    mcp_server: Tuple[FastMCP, Context],
+    mock_create_subprocess_exec: MagicMock,
+) -> None:
+    s, ctx = mcp_server
+    expect = Note(
+        note="test note",
+        identifier="1234567890",
+        title="test note",
+        tags=["a", "b"],
+        modificationDate="2023-01-01T00:00:00Z",
+        creationDate="2023-01-01T00:00:00Z",
+    )
+    mock_create_subprocess_exec.stubbed_queries = _encode_tags(expect.model_dump())
+
+    ids = ["1234567890", "0987654321"]
+    callback_ids = ["5f0e4b6c", "9a1d27e3"]
+    with patch("mcp_bear.uuid4", side_effect=[MagicMock(hex=callback_id) for callback_id in callback_ids]):
+        res = await s._tool_manager.call_tool("open_notes", arguments={"ids": ids}, context=ctx)
+    assert res == [expect, expect]
+    assert len(ctx.request_context.lifespan_context.futures) == 0
+
+    calls = []
+    for note_id, callback_id in zip(ids, callback_ids):
+        req_params = {
+            "new_window": "no",
+            "float": "no",
+            "show_window": "no",
+            "open_note": "no",
+            "selected": "no",
+            "edit": "no",
+            "id": note_id,
+            "x-success": f"xfwder://{temp_socket.stem}/{callback_id}/success",
+            "x-error": f"xfwder://{temp_socket.stem}/{callback_id}/error",
+        }
+        calls.append(
+            call(
+                "/usr/bin/open",
+                "-g",
+                "-j",
+                f"{BASE_URL}/open-note?{urlencode(req_params, quote_via=quote)}",
+                stdin=DEVNULL,
+                stdout=DEVNULL,
+            )
+        )
+    mock_create_subprocess_exec.assert_has_calls(calls, any_order=True)
+    assert mock_create_subprocess_exec.call_count == len(ids)
+
+
+@pytest.mark.anyio
+async def test_open_notes_limits_concurrent_opens(mcp_server: Tuple[FastMCP, Context[Any, AppContext]]) -> None:
+    s, ctx = mcp_server
+    futures = ctx.request_context.lifespan_context.futures
+    active = 0
+    peak = 0
+
+    async def open_url(url: str) -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+        queries = parse_qs(urlparse(url).query)
+        req_id = urlparse(queries["x-success"][0]).path.split("/")[1]
+        futures[req_id].set_result(
+            QueryParams(
+                {
+                    "note": "test note",
+                    "identifier": queries["id"][0],
+                    "title": "test note",
+                    "modificationDate": "2023-01-01T00:00:00Z",
+                    "creationDate": "2023-01-01T00:00:00Z",
+                }
+            )
+        )
+
+    ids = [str(i) for i in range(3 * _MAX_CONCURRENT_OPENS)]
+    with patch("mcp_bear._open_url", side_effect=open_url):
+        res = await s._tool_manager.call_tool("open_notes", arguments={"ids": ids}, context=ctx)
+
+    assert [note.identifier for note in res] == ids
+    assert peak == _MAX_CONCURRENT_OPENS
+    assert len(futures) == 0
+
+
+@pytest.mark.anyio
+async def test_open_notes_keeps_other_requests(
+    mcp_server: Tuple[FastMCP, Context[Any, AppContext]],
+    mock_create_subprocess_exec: MagicMock,
+) -> None:
+    s, ctx = mcp_server
+    expect = Note(
+        note="test note",
+        identifier="1234567890",
+        title="test note",
+        modificationDate="2023-01-01T00:00:00Z",
+        creationDate="2023-01-01T00:00:00Z",
+    )
+    mock_create_subprocess_exec.stubbed_queries = expect.model_dump(exclude_none=True)
+
+    # a concurrent request whose client-chosen id looks like a derived callback id
+    futures = ctx.request_context.lifespan_context.futures
+    other: asyncio.Future = asyncio.get_running_loop().create_future()
+    futures[f"{ctx.request_id}-0"] = other
+
+    res = await s._tool_manager.call_tool("open_notes", arguments={"ids": ["1234567890"]}, context=ctx)
+    assert res == [expect]
+    assert futures == {f"{ctx.request_id}-0": other}
+    assert not other.done()
+
+
+@pytest.mark.anyio
+async def test_open_notes_failed(
+    mcp_server: Tuple[FastMCP, Context[Any, AppContext]], mock_create_subprocess_exec_error: MagicMock
+) -> None:
+    s, ctx = mcp_server
+    with pytest.raises(ToolError) as excinfo:
+        await s._tool_manager.call_tool("open_notes", arguments={"ids": ["1234567890", "0987654321"]}, context=ctx)
+
+    assert "test error message" in str(excinfo.value)
+    assert len(ctx.request_context.lifespan_context.futures) == 0
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "arguments,expect_req_params",
@@ -200,7 +374,12 @@ async def test_create(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/create?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/create?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -265,7 +444,12 @@ async def test_replace_note(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/add-text?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/add-text?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -303,18 +487,23 @@ async def test_add_title(
     assert len(ctx.request_context.lifespan_context.futures) == 0
 
     req_params = {
-        "id": "123",
-        "text": expect,
         "mode": "prepend",
         "open_note": "no",
         "new_window": "no",
         "show_window": "no",
         "edit": "no",
+        "id": "123",
+        "text": expect,
         "x-success": f"xfwder://{temp_socket.stem}/{ctx.request_id}/success",
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/add-text?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/add-text?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -390,7 +579,12 @@ async def test_add_file(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/add-file?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/add-file?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -420,7 +614,7 @@ async def test_add_file_http_request(
     temp_socket: Path,
     mcp_server: Tuple[FastMCP, Context],
     mock_create_subprocess_exec: MagicMock,
-    mock_requests_get: MagicMock,
+    mock_httpx_stream: MagicMock,
     arguments: dict,
     expect_req_params: dict,
 ) -> None:
@@ -441,9 +635,146 @@ async def test_add_file_http_request(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/add-file?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/add-file?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
+    )
+    mock_httpx_stream.assert_called_once_with("GET", arguments["file"])
+
+
+@pytest.mark.anyio
+async def test_add_file_http_request_retry(
+    mcp_server: Tuple[FastMCP, Context],
+    mock_create_subprocess_exec: MagicMock,
+    mock_httpx_stream: MagicMock,
+) -> None:
+    s, ctx = mcp_server
+    mock_create_subprocess_exec.stubbed_queries = {}
+
+    ok_response = mock_httpx_stream.return_value.__aenter__.return_value
+    busy_response = MagicMock()
+    busy_response.status_code = 429
+    busy_response.headers = {"Retry-After": "0"}
+    busy_response.aread = AsyncMock()
+    busy = MagicMock()
+    busy.__aenter__.return_value = busy_response
+    ok = MagicMock()
+    ok.__aenter__.return_value = ok_response
+    mock_httpx_stream.side_effect = [busy, ok]
+
+    arguments = {"id": "123456", "file": "https://example.com", "filename": "test.txt"}
+    await s._tool_manager.call_tool("add_file", arguments=arguments, context=ctx)
+
+    assert mock_httpx_stream.call_count == 2
+    assert "file=bW9ja2VkIGh0dHAgcmVxdWVzdA%3D%3D" in mock_create_subprocess_exec.call_args.args[-1]
+
+
+@pytest.mark.anyio
+async def test_download_base64_releases_response_before_retry(mock_httpx_stream: MagicMock) -> None:
+    events: list[Any] = []
+
+    ok_response = mock_httpx_stream.return_value.__aenter__.return_value
+    busy_response = MagicMock()
+    busy_response.status_code = 503
+    busy_response.headers = {"Retry-After": "2"}
+    busy_response.aread = AsyncMock(side_effect=lambda: events.append("read"))
+    busy = MagicMock()
+    busy.__aenter__.return_value = busy_response
+    busy.__aexit__.side_effect = lambda *_args: events.append("closed")
+    ok = MagicMock()
+    ok.__aenter__.return_value = ok_response
+    mock_httpx_stream.side_effect = [busy, ok]
+
+    async with httpx.AsyncClient() as client:
+        with patch("asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            mock_sleep.side_effect = lambda delay: events.append(("sleep", delay))
+            res = await _download_base64(client, "https://example.com")
+
+    assert res == "bW9ja2VkIGh0dHAgcmVxdWVzdA=="
+    assert events == ["read", "closed", ("sleep", 2.0)]
+
+
+@pytest.mark.anyio
+async def test_add_file_http_request_retry_transport_error(
+    mcp_server: Tuple[FastMCP, Context],
+    mock_create_subprocess_exec: MagicMock,
+    mock_httpx_stream: MagicMock,
+) -> None:
+    s, ctx = mcp_server
+    mock_create_subprocess_exec.stubbed_queries = {}
+
+    ok_response = mock_httpx_stream.return_value.__aenter__.return_value
+    broken = MagicMock()
+    broken.__aenter__.side_effect = httpx.ConnectError("connection refused")
+    ok = MagicMock()
+    ok.__aenter__.return_value = ok_response
+    mock_httpx_stream.side_effect = [broken, ok]
+
+    arguments = {"id": "123456", "file": "https://example.com", "filename": "test.txt"}
+    with patch("mcp_bear._RETRY_BACKOFF", 0):
+        await s._tool_manager.call_tool("add_file", arguments=arguments, context=ctx)
+
+    assert mock_httpx_stream.call_count == 2
+    assert "file=bW9ja2VkIGh0dHAgcmVxdWVzdA%3D%3D" in mock_create_subprocess_exec.call_args.args[-1]
+
+
+@pytest.mark.anyio
+async def test_add_file_http_request_retry_exhausted(
+    mcp_server: Tuple[FastMCP, Context[Any, AppContext]],
+    mock_create_subprocess_exec: MagicMock,
+    mock_httpx_stream: MagicMock,
+) -> None:
+    s, ctx = mcp_server
+
+    busy_response = MagicMock()
+    busy_response.status_code = 429
+    busy_response.headers = {"Retry-After": "0"}
+    busy_response.aread = AsyncMock()
+    busy_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+        "Too Many Requests", request=MagicMock(), response=busy_response
     )
-    mock_requests_get.assert_called_once_with(arguments["file"])
+    mock_httpx_stream.return_value.__aenter__.return_value = busy_response
+
+    arguments = {"id": "123456", "file": "https://example.com", "filename": "test.txt"}
+    with pytest.raises(ToolError) as excinfo:
+        await s._tool_manager.call_tool("add_file", arguments=arguments, context=ctx)
+
+    assert "Too Many Requests" in str(excinfo.value)
+    assert mock_httpx_stream.call_count == _DOWNLOAD_ATTEMPTS
+    busy_response.raise_for_status.assert_called_once()
+    mock_create_subprocess_exec.assert_not_called()
+    assert len(ctx.request_context.lifespan_context.futures) == 0
+
+
+@pytest.mark.parametrize(
+    "value,expect",
+    [
+        (None, 1.0),
+        ("5", 5.0),
+        ("0", 0.0),
+        ("-3", 0.0),
+        ("3600", 30.0),
+        ("nan", 1.0),
+        ("inf", 1.0),
+        ("1.5", 1.0),
+        ("soon", 1.0),
+    ],
+)
+def test_retry_after(value: str | None, expect: float) -> None:
+    assert _retry_after(value, 1.0) == expect
+
+
+def test_retry_after_http_date() -> None:
+    now = datetime.now(timezone.utc)
+
+    assert _retry_after(format_datetime(now + timedelta(seconds=10), usegmt=True), 1.0) == pytest.approx(10, abs=2)
+    assert _retry_after(format_datetime(now - timedelta(seconds=10), usegmt=True), 1.0) == 0.0
+    assert _retry_after(format_datetime(now + timedelta(hours=1), usegmt=True), 1.0) == 30.0
+    # "-0000" parses to a naive datetime, which can't be compared with the current time
+    assert _retry_after(format_datetime((now + timedelta(seconds=10)).replace(tzinfo=None)), 1.0) == 1.0
 
 
 @pytest.mark.anyio
@@ -486,7 +817,12 @@ async def test_tags(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/tags?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/tags?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -531,13 +867,18 @@ async def test_open_tag(
     assert len(ctx.request_context.lifespan_context.futures) == 0
 
     req_params = {
-        "name": "test_tag",
         "token": BEAR_TOKEN,
+        "name": "test_tag",
         "x-success": f"xfwder://{temp_socket.stem}/{ctx.request_id}/success",
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/open-tag?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/open-tag?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -566,14 +907,19 @@ async def test_rename_tag(
     assert len(ctx.request_context.lifespan_context.futures) == 0
 
     req_params = {
+        "show_window": "no",
         "name": "old name",
         "new_name": "new name",
-        "show_window": "no",
         "x-success": f"xfwder://{temp_socket.stem}/{ctx.request_id}/success",
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/rename-tag?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/rename-tag?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -604,13 +950,18 @@ async def test_delete_tag(
     assert len(ctx.request_context.lifespan_context.futures) == 0
 
     req_params = {
-        "name": "tag name",
         "show_window": "no",
+        "name": "tag name",
         "x-success": f"xfwder://{temp_socket.stem}/{ctx.request_id}/success",
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/delete-tag?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/delete-tag?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -649,7 +1000,12 @@ async def test_trash(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/trash?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/trash?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -688,7 +1044,12 @@ async def test_archive(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/archive?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/archive?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -740,7 +1101,12 @@ async def test_untagged(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/untagged?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/untagged?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -792,7 +1158,12 @@ async def test_todo(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/todo?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/todo?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -844,7 +1215,12 @@ async def test_today(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/today?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/today?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -896,7 +1272,12 @@ async def test_locked(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/locked?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/locked?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -950,7 +1331,12 @@ async def test_search(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/search?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/search?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -994,7 +1380,12 @@ async def test_grab_url(
         "x-error": f"xfwder://{temp_socket.stem}/{ctx.request_id}/error",
     }
     mock_create_subprocess_exec.assert_called_once_with(
-        "open", "-g", "-j", f"{BASE_URL}/grab-url?{urlencode(req_params, quote_via=quote)}"
+        "/usr/bin/open",
+        "-g",
+        "-j",
+        f"{BASE_URL}/grab-url?{urlencode(req_params, quote_via=quote)}",
+        stdin=DEVNULL,
+        stdout=DEVNULL,
     )
 
 
@@ -1008,3 +1399,65 @@ async def test_grab_url_failed(
 
     assert "test error message" in str(excinfo.value)
     assert len(ctx.request_context.lifespan_context.futures) == 0
+
+
+@pytest.mark.anyio
+async def test_open_url_with_workspace(mock_workspace: Tuple[MagicMock, MagicMock, MagicMock]) -> None:
+    mock_ws, mock_url, mock_config = mock_workspace
+    url = f"{BASE_URL}/open-note?id=1234567890"
+
+    await _open_url(url)
+
+    mock_url.URLWithString_.assert_called_once_with(url)
+    config = mock_config.configuration.return_value
+    config.setActivates_.assert_called_once_with(False)
+    config.setHides_.assert_called_once_with(True)
+    mock_ws.sharedWorkspace.return_value.openURL_configuration_completionHandler_.assert_called_once_with(
+        mock_url.URLWithString_.return_value, config, ANY
+    )
+
+
+@pytest.mark.anyio
+async def test_open_url_with_workspace_failed(mock_workspace: Tuple[MagicMock, MagicMock, MagicMock]) -> None:
+    mock_ws, _, _ = mock_workspace
+    mock_ws.error = MagicMock()
+    mock_ws.error.localizedDescription.return_value = "The application can't be opened."
+
+    with pytest.raises(RuntimeError) as excinfo:
+        await _open_url(f"{BASE_URL}/open-note?id=1234567890")
+
+    assert str(excinfo.value) == "failed to open Bear (The application can't be opened.)."
+
+
+@pytest.mark.anyio
+async def test_open_url_with_workspace_invalid_url(mock_workspace: Tuple[MagicMock, MagicMock, MagicMock]) -> None:
+    mock_ws, mock_url, _ = mock_workspace
+    mock_url.URLWithString_.return_value = None
+
+    with pytest.raises(ValueError):
+        await _open_url("not a url")
+
+    mock_ws.sharedWorkspace.return_value.openURL_configuration_completionHandler_.assert_not_called()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/{req_id}/bogus", "/unknown/success", "/unknown/error"])
+async def test_callback_not_found(
+    temp_socket: Path, mcp_server: Tuple[FastMCP, Context[Any, AppContext]], path: str
+) -> None:
+    _, ctx = mcp_server
+    futures = ctx.request_context.lifespan_context.futures
+    pending: asyncio.Future = asyncio.get_running_loop().create_future()
+    futures[ctx.request_id] = pending
+
+    for _ in range(100):
+        if temp_socket.exists():
+            break
+        await asyncio.sleep(0.01)
+
+    async with httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(uds=str(temp_socket))) as client:
+        res = await client.post(f"http://callback{path.format(req_id=ctx.request_id)}?note=test")
+
+    assert res.status_code == 404
+    assert futures == {ctx.request_id: pending}
+    assert not pending.done()